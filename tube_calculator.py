@@ -10,13 +10,50 @@ Date: July 2025
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+import csv
+import functools
 import math
-from io import BytesIO
-import CoolProp.CoolProp as CP
-from CoolProp.CoolProp import PropsSI
+import uuid
+from io import BytesIO, StringIO
+
+# Plotly and CoolProp are deliberately not imported at module scope - both
+# are heavyweight and dominate Streamlit cold-start time, and every new
+# session re-imports this script. They are loaded on first use instead.
+
+@functools.lru_cache(maxsize=None)
+def _coolprop():
+    """Import CoolProp on first use (its init costs seconds at cold start)"""
+    import CoolProp.CoolProp as CP
+    return CP
+
+@functools.lru_cache(maxsize=None)
+def _plotly():
+    """Import the plotly modules used by the visualization on first use"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    return go, make_subplots
+
+# Segment palette (ColorBrewer Set3) and viridis anchor colors, inlined so
+# plotly.express - which drags in heavy optional bindings - is not imported
+# just for color sampling
+_SET3 = ['rgb(141,211,199)', 'rgb(255,255,179)', 'rgb(190,186,218)',
+         'rgb(251,128,114)', 'rgb(128,177,211)', 'rgb(253,180,98)',
+         'rgb(179,222,105)', 'rgb(252,205,229)', 'rgb(217,217,217)',
+         'rgb(188,128,189)', 'rgb(204,235,197)', 'rgb(255,237,111)']
+
+_VIRIDIS_RGB = np.array([
+    [68, 1, 84], [72, 40, 120], [62, 73, 137], [49, 104, 142],
+    [38, 130, 142], [31, 158, 137], [53, 183, 121], [110, 206, 88],
+    [181, 222, 43], [253, 231, 37]
+], dtype=float)
+
+def _sample_viridis(n):
+    """Sample n evenly spaced colors from the viridis colormap anchors"""
+    positions = np.linspace(0.0, 1.0, n)
+    anchors = np.linspace(0.0, 1.0, len(_VIRIDIS_RGB))
+    rgb = np.stack([np.interp(positions, anchors, _VIRIDIS_RGB[:, channel])
+                    for channel in range(3)], axis=1)
+    return [f"rgb({r},{g},{b})" for r, g, b in rgb.round().astype(int)]
 
 # Configure Streamlit page
 st.set_page_config(
@@ -144,10 +181,61 @@ WALL_THICKNESS = {
     "0.500\"": {"mm": 12.70, "in": 0.500}
 }
 
+# Frozen option lists for the selectbox widgets, so reruns don't rebuild a
+# list (and linear-scan it with .index) per widget per interaction
+TUBE_SIZE_NAMES = tuple(TUBE_SIZES)
+PIPE_SIZE_NAMES = tuple(PIPE_SIZES)
+WALL_THICKNESS_NAMES = tuple(WALL_THICKNESS)
+MATERIAL_NAMES = tuple(MATERIALS)
+FLUID_NAMES = tuple(FLUIDS)
+
+# Index maps and flat lookup arrays built from the tables above.
+# Batch recomputation gathers from these with integer indices instead of
+# doing string-keyed dict-of-dict lookups once per segment.
+TUBE_SIZE_INDEX = {name: i for i, name in enumerate(TUBE_SIZES)}
+PIPE_SIZE_INDEX = {name: i for i, name in enumerate(PIPE_SIZES)}
+WALL_THICKNESS_INDEX = {name: i for i, name in enumerate(WALL_THICKNESS)}
+MATERIAL_INDEX = {name: i for i, name in enumerate(MATERIALS)}
+
+TUBE_OD_MM = np.array([s["od_mm"] for s in TUBE_SIZES.values()])
+TUBE_OD_IN = np.array([s["od_in"] for s in TUBE_SIZES.values()])
+PIPE_OD_MM = np.array([s["od_mm"] for s in PIPE_SIZES.values()])
+PIPE_OD_IN = np.array([s["od_in"] for s in PIPE_SIZES.values()])
+WT_MM = np.array([w["mm"] for w in WALL_THICKNESS.values()])
+WT_IN = np.array([w["in"] for w in WALL_THICKNESS.values()])
+DENSITY_KG_M3 = np.array([m["density"] for m in MATERIALS.values()])
+DENSITY_LB_IN3 = np.array([m["density_imperial"] for m in MATERIALS.values()])
+
+# Display unit labels - every per-rerun label is a function of the single
+# units flag, so look them up from one dict instead of repeating the
+# metric/imperial ternary at each call site.
+UNITS_METRIC = {
+    "length": "m", "diameter": "mm", "mass": "kg", "volume": "m³",
+    "temp": "°C", "pressure": "bar", "density": "kg/m³",
+    "length_input": "meters", "temp_cp": "C", "pressure_cp": "bar"
+}
+UNITS_IMPERIAL = {
+    "length": "ft", "diameter": "in", "mass": "lb", "volume": "ft³",
+    "temp": "°F", "pressure": "psi", "density": "lb/ft³",
+    "length_input": "feet", "temp_cp": "F", "pressure_cp": "psi"
+}
+
 class TubeSegment:
     """Class to represent a tube segment with all its properties"""
-    
-    def __init__(self, name, tube_type, size, wall_thickness, length, material, units="metric", 
+
+    # Fixed attribute set - avoids one __dict__ per instance and carries a
+    # per-instance cache of display-unit conversions (see get_display_values)
+    __slots__ = (
+        "name", "tube_type", "size", "wall_thickness", "length", "material",
+        "units", "is_continuous", "_size_id", "_wall_id", "_material_id",
+        "fluid_name", "temperature", "pressure", "temp_units", "pressure_units",
+        "od", "id", "wall_thickness_actual", "internal_volume",
+        "material_volume", "tube_mass", "fluid_density_kg_m3",
+        "fluid_density_lb_ft3", "fluid_phase", "fluid_error", "fluid_mass",
+        "mass", "_display_cache"
+    )
+
+    def __init__(self, name, tube_type, size, wall_thickness, length, material, units="metric",
                  fluid_name="None", temperature=20, pressure=1.013, temp_units="C", pressure_units="bar"):
         self.name = name
         self.tube_type = tube_type  # "Tube" or "Pipe"
@@ -157,6 +245,13 @@ class TubeSegment:
         self.material = material
         self.units = units
         self.is_continuous = True
+
+        # Integer indices into the module-level lookup arrays, resolved once
+        # at construction so property calculation avoids repeated
+        # string-keyed dict-of-dict lookups
+        self._size_id = TUBE_SIZE_INDEX[size] if tube_type == "Tube" else PIPE_SIZE_INDEX[size]
+        self._wall_id = WALL_THICKNESS_INDEX[wall_thickness]
+        self._material_id = MATERIAL_INDEX[material]
         
         # Fluid properties
         self.fluid_name = fluid_name
@@ -164,79 +259,43 @@ class TubeSegment:
         self.pressure = pressure
         self.temp_units = temp_units
         self.pressure_units = pressure_units
-        
+
+        # Per-units display-value cache, invalidated whenever the computed
+        # fields are (re)written
+        self._display_cache = {}
+
         # Calculate properties
         self._calculate_properties()
     
     def _calculate_properties(self):
         """Calculate volume, mass, and other properties"""
+        self._display_cache.clear()
+        # Cross-section geometry is shared by every segment with the same
+        # (type, size, wall, units) combo - the cached areas reduce this to
+        # two multiplies by length plus one by density
+        (od, id_, wt, area_inner,
+         area_material, area_material_mass) = _geometry_cache(
+            self.tube_type, self.size, self.wall_thickness, self.units)
+
         if self.units == "metric":
-            # Get dimensions in mm
-            if self.tube_type == "Tube":
-                od = TUBE_SIZES[self.size]["od_mm"]
-            else:
-                od = PIPE_SIZES[self.size]["od_mm"]
-            
-            wt = WALL_THICKNESS[self.wall_thickness]["mm"]
-            length = self.length * 1000  # Convert m to mm
-            density = MATERIALS[self.material]["density"]  # kg/m³
-            
-            # Calculate internal diameter
-            id_mm = od - 2 * wt
-            
-            # Volume calculations (in m³)
-            self.internal_volume = math.pi * (id_mm/2)**2 * length / 1e9  # m³
-            self.material_volume = math.pi * ((od/2)**2 - (id_mm/2)**2) * length / 1e9  # m³
-            
-            # Tube mass calculation (in kg)
-            self.tube_mass = self.material_volume * density
-            
-            # Store dimensions for display
-            self.od = od
-            self.id = id_mm
-            self.wall_thickness_actual = wt
-            
-            # Calculate fluid properties
-            self._calculate_fluid_properties()
-            
-            # Total mass = tube mass + fluid mass
-            self.mass = self.tube_mass + self.fluid_mass
-            
-        else:  # Imperial units
-            # Get dimensions in inches
-            if self.tube_type == "Tube":
-                od = TUBE_SIZES[self.size]["od_in"]
-            else:
-                od = PIPE_SIZES[self.size]["od_in"]
-            
-            wt = WALL_THICKNESS[self.wall_thickness]["in"]
-            length_in = self.length * 12  # Convert ft to inches
-            density_lbin3 = MATERIALS[self.material]["density_imperial"]  # lb/in³
-            
-            # Calculate internal diameter
-            id_in = od - 2 * wt
-            
-            # Volume calculations in cubic inches (more direct for mass calculation)
-            internal_volume_in3 = math.pi * (id_in/2)**2 * length_in  # in³
-            material_volume_in3 = math.pi * ((od/2)**2 - (id_in/2)**2) * length_in  # in³
-            
-            # Tube mass calculation (in lbs) - direct calculation in cubic inches
-            self.tube_mass = material_volume_in3 * density_lbin3
-            
-            # Convert volumes to standard units (ft³) for consistency
-            self.internal_volume = internal_volume_in3 / 1728  # ft³
-            self.material_volume = material_volume_in3 / 1728  # ft³
-            
-            # Store dimensions for display
-            self.od = od
-            self.id = id_in
-            self.wall_thickness_actual = wt
-            
-            # Calculate fluid properties
-            self._calculate_fluid_properties()
-            
-            # Total mass = tube mass + fluid mass
-            self.mass = self.tube_mass + self.fluid_mass
+            density = float(DENSITY_KG_M3[self._material_id])  # kg/m³
+        else:
+            density = float(DENSITY_LB_IN3[self._material_id])  # lb/in³
+
+        # Store dimensions for display
+        self.od = od
+        self.id = id_
+        self.wall_thickness_actual = wt
+
+        self.internal_volume = area_inner * self.length
+        self.material_volume = area_material * self.length
+        self.tube_mass = area_material_mass * self.length * density
+
+        # Calculate fluid properties
+        self._calculate_fluid_properties()
+
+        # Total mass = tube mass + fluid mass
+        self.mass = self.tube_mass + self.fluid_mass
     
     def _calculate_fluid_properties(self):
         """Calculate fluid mass and properties"""
@@ -260,102 +319,373 @@ class TubeSegment:
         else:
             self.fluid_mass = self.fluid_density_lb_ft3 * self.internal_volume  # lb
 
+def _geom_kernel(od, wt, axial_length, density):
+    """Core tube-geometry arithmetic shared by the scalar and batch paths
+
+    Works elementwise on scalars or NumPy arrays. od/wt/axial_length are in
+    consistent linear units (mm or in) and density in mass per cubic linear
+    unit; returns (internal_volume, material_volume, tube_mass) with the
+    volumes in the matching cubic units.
+    """
+    # Square each radius once and fold pi into the length factor, saving
+    # redundant multiplies and repeated math.pi attribute lookups
+    r_i = 0.5 * (od - 2 * wt)
+    r_o = 0.5 * od
+    r_i2 = r_i * r_i
+    r_o2 = r_o * r_o
+    pi_length = math.pi * axial_length
+    internal_volume = pi_length * r_i2
+    material_volume = pi_length * (r_o2 - r_i2)
+    return internal_volume, material_volume, material_volume * density
+
+@functools.lru_cache(maxsize=None)
+def _geometry_cache(tube_type, size, wall_thickness, units):
+    """Cached cross-section geometry for a (type, size, wall, units) combo
+
+    The parameter space is tiny (sizes × wall thicknesses), so every
+    combination is computed at most once per process. Returns
+    (od, id, wt, area_inner, area_material, area_material_mass) where od/id/wt
+    are in display units (mm or in), the areas yield display volumes (m³ or
+    ft³) when multiplied by the segment length in input units (m or ft), and
+    area_material_mass yields mass when additionally multiplied by density
+    (kg/m³ or lb/in³).
+    """
+    if units == "metric":
+        if tube_type == "Tube":
+            od = float(TUBE_OD_MM[TUBE_SIZE_INDEX[size]])
+        else:
+            od = float(PIPE_OD_MM[PIPE_SIZE_INDEX[size]])
+        wt = float(WT_MM[WALL_THICKNESS_INDEX[wall_thickness]])
+        axial_scale = 1000     # mm of axial length per m
+        volume_scale = 1e-9    # mm³ → m³
+        mass_volume_scale = 1e-9  # density is per m³
+    else:
+        if tube_type == "Tube":
+            od = float(TUBE_OD_IN[TUBE_SIZE_INDEX[size]])
+        else:
+            od = float(PIPE_OD_IN[PIPE_SIZE_INDEX[size]])
+        wt = float(WT_IN[WALL_THICKNESS_INDEX[wall_thickness]])
+        axial_scale = 12       # in of axial length per ft
+        volume_scale = 1 / 1728  # in³ → ft³
+        mass_volume_scale = 1.0  # density is per in³
+
+    iv_per_length, mv_per_length, _ = _geom_kernel(od, wt, axial_scale, 1.0)
+    return (od, od - 2 * wt, wt,
+            iv_per_length * volume_scale,
+            mv_per_length * volume_scale,
+            mv_per_length * mass_volume_scale)
+
+def _resolve_geometry(tube_type, size, wall_thickness, units):
+    """(od, wt, id) in display units for one size/wall combination
+
+    Thin view over _geometry_cache used by the form preview and the
+    submit-time validation, so both read the same memoized entry instead of
+    repeating the nested table lookups.
+    """
+    od, inner_d, wt, _, _, _ = _geometry_cache(tube_type, size, wall_thickness, units)
+    return od, wt, inner_d
+
+# Scale/offset tables for branchless temperature and pressure conversion;
+# T_K = T * scale + offset works elementwise on scalars or arrays
+_T_SCALE = {"K": 1.0, "C": 1.0, "F": 5/9}
+_T_OFFSET = {"K": 0.0, "C": 273.15, "F": -32 * 5/9 + 273.15}
+_P_SCALE = {"Pa": 1.0, "bar": 100000.0, "psi": 6894.76, "atm": 101325.0}
+
+def _to_kelvin(temperature, temp_units):
+    """Convert a temperature (scalar or array) to Kelvin; unknown units are
+    treated as Kelvin, matching the previous fall-through behavior"""
+    return temperature * _T_SCALE.get(temp_units, 1.0) + _T_OFFSET.get(temp_units, 0.0)
+
+def _to_pascal(pressure, pressure_units):
+    """Convert a pressure (scalar or array) to Pa; unknown units are treated
+    as Pa"""
+    return pressure * _P_SCALE.get(pressure_units, 1.0)
+
+# CoolProp phase index → human-readable phase name
+_PHASE_NAMES = {
+    0: "Liquid",
+    1: "Supercritical",
+    2: "Supercritical Gas",
+    3: "Supercritical Liquid",
+    5: "Gas",
+    6: "Two Phase"
+}
+
+def _phase_name(phase_index):
+    """Map a CoolProp phase index to a human-readable phase name"""
+    return _PHASE_NAMES.get(phase_index, f"Phase {phase_index}")
+
+def compute_fluid_props_batch(fluid_names, temperatures_K, pressures_Pa):
+    """Evaluate fluid density and phase for many segments at once
+
+    Segments are grouped by CoolProp fluid so each distinct fluid costs two
+    array-valued PropsSI calls (density + phase) instead of two scalar calls
+    per segment. Returns a list of result dicts in input order, matching the
+    shape returned by calculate_fluid_density.
+    """
+    PropsSI = _coolprop().PropsSI
+    temperatures_K = np.asarray(temperatures_K, dtype=float)
+    pressures_Pa = np.asarray(pressures_Pa, dtype=float)
+    results = [None] * len(fluid_names)
+
+    # Group segment indices by fluid
+    groups = {}
+    for i, name in enumerate(fluid_names):
+        groups.setdefault(name, []).append(i)
+
+    for name, idx in groups.items():
+        coolprop_name = FLUIDS[name]["coolprop_name"] if name in FLUIDS else None
+        if coolprop_name is None:
+            for i in idx:
+                results[i] = {"density_kg_m3": 0.0, "density_lb_ft3": 0.0,
+                              "phase": "None", "error_msg": None}
+            continue
+
+        T = temperatures_K[idx]
+        P = pressures_Pa[idx]
+        try:
+            densities = np.atleast_1d(PropsSI('D', 'T', T, 'P', P, coolprop_name))
+        except Exception:
+            # Fluid rejected outright - scalar path supplies the error dicts
+            for i in idx:
+                results[i] = calculate_fluid_density(
+                    name, float(temperatures_K[i]), float(pressures_Pa[i]), "K", "Pa")
+            continue
+
+        # Array-valued PropsSI reports invalid states as non-finite entries
+        # rather than raising. Route those through the scalar path so each
+        # segment gets its own error message, and evaluate phase only at the
+        # valid states so one bad segment doesn't degrade the rest of the
+        # group to "Unknown" (the grouped Phase call does raise).
+        finite = np.isfinite(densities)
+        phases = ["Unknown"] * len(idx)
+        if finite.any():
+            try:
+                phase_indices = np.atleast_1d(
+                    PropsSI('Phase', 'T', T[finite], 'P', P[finite], coolprop_name))
+                for pos, p in zip(np.flatnonzero(finite), phase_indices):
+                    phases[pos] = _phase_name(int(p))
+            except Exception:
+                pass
+
+        for j, i in enumerate(idx):
+            if finite[j]:
+                results[i] = {
+                    "density_kg_m3": float(densities[j]),
+                    "density_lb_ft3": float(densities[j]) * 0.062428,
+                    "phase": phases[j],
+                    "error_msg": None
+                }
+            else:
+                results[i] = calculate_fluid_density(
+                    name, float(temperatures_K[i]), float(pressures_Pa[i]), "K", "Pa")
+
+    return results
+
+def recompute_segments(segments):
+    """Recompute geometry and mass for all segments in one vectorized pass
+
+    Equivalent to calling _calculate_properties on every segment, but the
+    per-segment dict lookups and scalar arithmetic are replaced with NumPy
+    gathers and array math, so the Python-level dispatch cost stays constant
+    no matter how many segments are in the system.
+    """
+    if not segments:
+        return
+
+    is_tube = np.array([seg.tube_type == "Tube" for seg in segments])
+    is_metric = np.array([seg.units == "metric" for seg in segments])
+    size_idx = np.array([
+        TUBE_SIZE_INDEX[seg.size] if seg.tube_type == "Tube" else PIPE_SIZE_INDEX[seg.size]
+        for seg in segments
+    ])
+    wt_idx = np.array([WALL_THICKNESS_INDEX[seg.wall_thickness] for seg in segments])
+    mat_idx = np.array([MATERIAL_INDEX[seg.material] for seg in segments])
+    length = np.array([seg.length for seg in segments])
+
+    # Gather dimensions in each segment's native units (mm or in). Tube and
+    # pipe indices live in different tables of different lengths, so each
+    # table is indexed only with its own segments' indices - a combined
+    # np.where gather would index the 13-entry pipe table with tube indices
+    # up to 25 and fail.
+    od = np.empty(len(segments))
+    is_pipe = ~is_tube
+    od[is_tube] = np.where(is_metric[is_tube],
+                           TUBE_OD_MM[size_idx[is_tube]],
+                           TUBE_OD_IN[size_idx[is_tube]])
+    od[is_pipe] = np.where(is_metric[is_pipe],
+                           PIPE_OD_MM[size_idx[is_pipe]],
+                           PIPE_OD_IN[size_idx[is_pipe]])
+    wt = np.where(is_metric, WT_MM[wt_idx], WT_IN[wt_idx])
+    id_ = od - 2 * wt
+    density = np.where(is_metric, DENSITY_KG_M3[mat_idx], DENSITY_LB_IN3[mat_idx])
+
+    # Axial length in mm (metric) or inches (imperial); density scaled to
+    # mass per cubic linear unit so the kernel's mass comes out in kg/lb
+    axial_length = np.where(is_metric, length * 1000, length * 12)
+    density_scaled = np.where(is_metric, density * 1e-9, density)
+
+    internal_volume_raw, material_volume_raw, tube_mass = _geom_kernel(
+        od, wt, axial_length, density_scaled)
+
+    # Report volumes in m³ (metric) or ft³ (imperial)
+    internal_volume = np.where(is_metric, internal_volume_raw / 1e9, internal_volume_raw / 1728)
+    material_volume = np.where(is_metric, material_volume_raw / 1e9, material_volume_raw / 1728)
+
+    # Fluid properties: one batched CoolProp evaluation per distinct fluid
+    fluid_props = compute_fluid_props_batch(
+        [seg.fluid_name for seg in segments],
+        [_to_kelvin(seg.temperature, seg.temp_units) for seg in segments],
+        [_to_pascal(seg.pressure, seg.pressure_units) for seg in segments]
+    )
+
+    # Scatter results back onto the segment objects
+    for i, seg in enumerate(segments):
+        seg._display_cache.clear()
+        seg.od = float(od[i])
+        seg.id = float(id_[i])
+        seg.wall_thickness_actual = float(wt[i])
+        seg.internal_volume = float(internal_volume[i])
+        seg.material_volume = float(material_volume[i])
+        seg.tube_mass = float(tube_mass[i])
+
+        props = fluid_props[i]
+        seg.fluid_density_kg_m3 = props["density_kg_m3"]
+        seg.fluid_density_lb_ft3 = props["density_lb_ft3"]
+        seg.fluid_phase = props["phase"]
+        seg.fluid_error = props["error_msg"]
+        if seg.units == "metric":
+            seg.fluid_mass = seg.fluid_density_kg_m3 * seg.internal_volume  # kg
+        else:
+            seg.fluid_mass = seg.fluid_density_lb_ft3 * seg.internal_volume  # lb
+        seg.mass = seg.tube_mass + seg.fluid_mass
+
+# Field → conversion-factor tables for get_display_values. Divisions are
+# folded into reciprocal multiplies ahead of time so a conversion is one
+# multiply per field with no per-call branching on the field type.
+_METRIC_TO_IMPERIAL_FACTORS = {
+    'length': 3.28084,                 # m to ft
+    'od': 1 / 25.4,                    # mm to in
+    'id': 1 / 25.4,
+    'wall_thickness_actual': 1 / 25.4,
+    'mass': 2.20462,                   # kg to lb
+    'tube_mass': 2.20462,
+    'fluid_mass': 2.20462,
+    'internal_volume': 35.3147,        # m³ to ft³
+    'material_volume': 35.3147
+}
+_IMPERIAL_TO_METRIC_FACTORS = {
+    'length': 1 / 3.28084,             # ft to m
+    'od': 25.4,                        # in to mm
+    'id': 25.4,
+    'wall_thickness_actual': 25.4,
+    'mass': 1 / 2.20462,               # lb to kg
+    'tube_mass': 1 / 2.20462,
+    'fluid_mass': 1 / 2.20462,
+    'internal_volume': 1 / 35.3147,    # ft³ to m³
+    'material_volume': 1 / 35.3147
+}
+_IDENTITY_FACTORS = {field: 1.0 for field in _METRIC_TO_IMPERIAL_FACTORS}
+
+# Converted display values are cached on the segment itself (one entry per
+# target unit system) so repeated chart/export/list renders reuse the same
+# conversion; the cache is cleared whenever the computed fields are
+# rewritten.
+
 def get_display_values(segment, target_units):
     """Convert segment values for display in the target unit system"""
+    cached = segment._display_cache.get(target_units)
+    if cached is not None:
+        return cached
+
     if segment.units == target_units:
-        # No conversion needed
-        return {
-            'length': segment.length,
-            'od': segment.od,
-            'id': segment.id,
-            'wall_thickness_actual': segment.wall_thickness_actual,
-            'mass': segment.mass,
-            'tube_mass': segment.tube_mass,
-            'fluid_mass': segment.fluid_mass,
-            'internal_volume': segment.internal_volume,
-            'material_volume': segment.material_volume
-        }
-    
-    # Conversion needed
-    if segment.units == "metric" and target_units == "imperial":
-        # Convert from metric to imperial
-        return {
-            'length': segment.length * 3.28084,  # m to ft
-            'od': segment.od / 25.4,  # mm to in
-            'id': segment.id / 25.4,  # mm to in
-            'wall_thickness_actual': segment.wall_thickness_actual / 25.4,  # mm to in
-            'mass': segment.mass * 2.20462,  # kg to lb
-            'tube_mass': segment.tube_mass * 2.20462,  # kg to lb
-            'fluid_mass': segment.fluid_mass * 2.20462,  # kg to lb
-            'internal_volume': segment.internal_volume * 35.3147,  # m³ to ft³
-            'material_volume': segment.material_volume * 35.3147  # m³ to ft³
-        }
-    elif segment.units == "imperial" and target_units == "metric":
-        # Convert from imperial to metric
-        return {
-            'length': segment.length / 3.28084,  # ft to m
-            'od': segment.od * 25.4,  # in to mm
-            'id': segment.id * 25.4,  # in to mm
-            'wall_thickness_actual': segment.wall_thickness_actual * 25.4,  # in to mm
-            'mass': segment.mass / 2.20462,  # lb to kg
-            'tube_mass': segment.tube_mass / 2.20462,  # lb to kg
-            'fluid_mass': segment.fluid_mass / 2.20462,  # lb to kg
-            'internal_volume': segment.internal_volume / 35.3147,  # ft³ to m³
-            'material_volume': segment.material_volume / 35.3147  # ft³ to m³
-        }
+        factors = _IDENTITY_FACTORS
+    elif segment.units == "metric":
+        factors = _METRIC_TO_IMPERIAL_FACTORS
+    else:
+        factors = _IMPERIAL_TO_METRIC_FACTORS
+
+    result = {field: getattr(segment, field) * factor
+              for field, factor in factors.items()}
+    segment._display_cache[target_units] = result
+    return result
+
+# Metric → imperial conversion factor per summable segment field
+_METRIC_TO_IMPERIAL = {
+    "length": 3.28084,            # m to ft
+    "internal_volume": 35.3147,   # m³ to ft³
+    "mass": 2.20462,              # kg to lb
+    "tube_mass": 2.20462,
+    "fluid_mass": 2.20462,
+    "material_volume": 35.3147
+}
+
+class SegmentStore:
+    """Structure-of-arrays view over a list of TubeSegment objects
+
+    Holds the summable per-segment quantities as parallel NumPy columns so
+    that aggregation is a handful of array reductions instead of a Python
+    loop with a dict allocation per segment.
+    """
+
+    FIELDS = ("length", "internal_volume", "mass", "tube_mass",
+              "fluid_mass", "material_volume")
+
+    def __init__(self, segments=()):
+        self.rebuild(segments)
+
+    def rebuild(self, segments):
+        """Refresh all columns from the current segment list"""
+        self.is_metric = np.array([seg.units == "metric" for seg in segments], dtype=bool)
+        for field in self.FIELDS:
+            setattr(self, field,
+                    np.array([getattr(seg, field) for seg in segments], dtype=float))
+
+    def append(self, segment):
+        """Add one segment's values to the end of every column"""
+        self.is_metric = np.append(self.is_metric, segment.units == "metric")
+        for field in self.FIELDS:
+            setattr(self, field,
+                    np.append(getattr(self, field), getattr(segment, field)))
+
+    def remove(self, index):
+        """Drop one segment's values from every column"""
+        self.is_metric = np.delete(self.is_metric, index)
+        for field in self.FIELDS:
+            setattr(self, field, np.delete(getattr(self, field), index))
+
+    def totals(self, target_units=None):
+        """Vectorized totals, optionally converted to a target unit system"""
+        result = {}
+        for field in self.FIELDS:
+            column = getattr(self, field)
+            if target_units and column.size:
+                factor = _METRIC_TO_IMPERIAL[field]
+                if target_units == "imperial":
+                    column = column * np.where(self.is_metric, factor, 1.0)
+                else:
+                    column = column * np.where(self.is_metric, 1.0, 1.0 / factor)
+            result[f"total_{field}"] = float(column.sum())
+        return result
 
 def calculate_totals(segments, target_units=None):
     """Calculate total values for all segments in the target unit system"""
-    if not segments:
-        return {
-            "total_length": 0,
-            "total_internal_volume": 0,
-            "total_mass": 0,
-            "total_tube_mass": 0,
-            "total_fluid_mass": 0,
-            "total_material_volume": 0
-        }
-    
-    total_length = 0
-    total_internal_volume = 0
-    total_mass = 0
-    total_tube_mass = 0
-    total_fluid_mass = 0
-    total_material_volume = 0
-    
-    for seg in segments:
-        if target_units:
-            # Get converted values
-            display_values = get_display_values(seg, target_units)
-            total_length += display_values['length']
-            total_internal_volume += display_values['internal_volume']
-            total_mass += display_values['mass']
-            total_tube_mass += display_values['tube_mass']
-            total_fluid_mass += display_values['fluid_mass']
-            total_material_volume += display_values['material_volume']
-        else:
-            # Use original values
-            total_length += seg.length
-            total_internal_volume += seg.internal_volume
-            total_mass += seg.mass
-            total_tube_mass += seg.tube_mass
-            total_fluid_mass += seg.fluid_mass
-            total_material_volume += seg.material_volume
-    
-    return {
-        "total_length": total_length,
-        "total_internal_volume": total_internal_volume,
-        "total_mass": total_mass,
-        "total_tube_mass": total_tube_mass,
-        "total_fluid_mass": total_fluid_mass,
-        "total_material_volume": total_material_volume
-    }
+    return SegmentStore(segments).totals(target_units)
 
 def create_2d_visualization(segments, units):
     """Create 2D visualization of the tube system"""
     if not segments:
         return None
     
+    go, make_subplots = _plotly()
+
+    # Convert every segment once up front; all panels index into this list
+    dv = [get_display_values(seg, units) for seg in segments]
+
+    # SVG Scatter degrades badly past a few thousand vertices; switch the
+    # layout panel to WebGL once the system is large enough to matter
+    scatter_cls = go.Scattergl if len(segments) > 50 else go.Scatter
+
     fig = make_subplots(
         rows=2, cols=2,
         subplot_titles=("System Layout", "Diameter Distribution", "Mass Distribution (Tube + Fluid)", "Volume Distribution"),
@@ -363,68 +693,82 @@ def create_2d_visualization(segments, units):
                [{"type": "bar"}, {"type": "bar"}]]
     )
       # System Layout (Top Left)
-    x_pos = 0
-    
-    # Improved color handling for many segments
-    if len(segments) <= len(px.colors.qualitative.Set3):
-        colors = px.colors.qualitative.Set3
+    # Per-segment colors, computed once before the loop. Large systems
+    # sample the continuous colorscale at a fixed number of levels instead
+    # of one level per segment, so the fused layout panel keeps a bounded
+    # trace count (one trace per distinct color).
+    if len(segments) <= len(_SET3):
+        palette = _SET3
     else:
-        # Use a continuous colorscale for many segments
-        colors = px.colors.sample_colorscale("viridis", [i/(len(segments)-1) for i in range(len(segments))])
+        palette = _sample_viridis(12)
+    segment_colors = [palette[i % len(palette)] for i in range(len(segments))]
     
-    for i, segment in enumerate(segments):
-        # Get converted values for display
-        display_values = get_display_values(segment, units)
-        
-        if segment.is_continuous and i > 0:
-            # Continuous segment - connects to previous
-            x_start = x_pos
-        else:
-            # Separate segment - add gap
-            x_pos += 1
-            x_start = x_pos
-        
-        x_end = x_start + display_values['length']
-        
-        # Draw tube as rectangle
-        color = colors[i % len(colors)]
+    # Concatenate all rectangles into one trace per color (outer) plus a
+    # single inner-bore trace, using None separators between polygons, so
+    # the layout panel stays at a handful of traces regardless of segment
+    # count - Plotly render cost scales with trace count, not vertex count.
+    # Segment geometry as arrays: x positions come from a cumulative sum of
+    # lengths plus a cumulative sum of unit gaps (one gap before each
+    # non-continuous segment), and each rectangle is a row of 5 vertices
+    # plus a NaN separator column - NaN breaks polygons exactly like None.
+    n = len(segments)
+    lengths = np.array([d['length'] for d in dv])
+    gaps = np.array([0.0 if (segments[i].is_continuous and i > 0) else 1.0
+                     for i in range(n)])
+    x_starts = np.concatenate(([0.0], np.cumsum(lengths)[:-1])) + np.cumsum(gaps)
+    x_ends = x_starts + lengths
+    half_od = np.array([d['od'] for d in dv]) / 2
+    half_id = np.array([d['id'] for d in dv]) / 2
+    nan_col = np.full(n, np.nan)
+    xs = np.column_stack([x_starts, x_ends, x_ends, x_starts, x_starts, nan_col])
+    ys_od = np.column_stack([-half_od, -half_od, half_od, half_od, -half_od, nan_col])
+    ys_id = np.column_stack([-half_id, -half_id, half_id, half_id, -half_id, nan_col])
+
+    hover_texts = [(f"<b>{segments[i].name}</b><br>" +
+                    f"Length: {dv[i]['length']:.2f}<br>" +
+                    f"OD: {dv[i]['od']:.2f}<br>" +
+                    f"ID: {dv[i]['id']:.2f}")
+                   for i in range(n)]
+
+    # Outer rectangles - one trace per color, per-segment hover via text
+    for color in dict.fromkeys(segment_colors):
+        mask = np.array([c == color for c in segment_colors])
+        text = []
+        for i in np.flatnonzero(mask):
+            text.extend([hover_texts[i]] * 5 + [None])
         fig.add_trace(
-            go.Scatter(
-                x=[x_start, x_end, x_end, x_start, x_start],
-                y=[-display_values['od']/2, -display_values['od']/2, display_values['od']/2, display_values['od']/2, -display_values['od']/2],
+            scatter_cls(
+                x=xs[mask].ravel(),
+                y=ys_od[mask].ravel(),
+                mode="lines",
                 fill="toself",
                 fillcolor=color,
                 line=dict(color="black", width=1),
-                name=segment.name,
-                showlegend=True,
-                hovertemplate=f"<b>{segment.name}</b><br>" +
-                             f"Length: {display_values['length']:.2f}<br>" +
-                             f"OD: {display_values['od']:.2f}<br>" +
-                             f"ID: {display_values['id']:.2f}<br>" +
-                             "<extra></extra>"
+                text=text,
+                hovertemplate="%{text}<extra></extra>",
+                showlegend=False
             ),
             row=1, col=1
         )
-        
-        # Draw internal diameter
-        fig.add_trace(
-            go.Scatter(
-                x=[x_start, x_end, x_end, x_start, x_start],
-                y=[-display_values['id']/2, -display_values['id']/2, display_values['id']/2, display_values['id']/2, -display_values['id']/2],
-                fill="toself",
-                fillcolor="white",
-                line=dict(color="gray", width=0.5),
-                showlegend=False,
-                hoverinfo="skip"
-            ),
-            row=1, col=1
-        )
-        
-        x_pos = x_end
+
+    # Inner bores - a single white trace covering all segments
+    fig.add_trace(
+        scatter_cls(
+            x=xs.ravel(),
+            y=ys_id.ravel(),
+            mode="lines",
+            fill="toself",
+            fillcolor="white",
+            line=dict(color="gray", width=0.5),
+            showlegend=False,
+            hoverinfo="skip"
+        ),
+        row=1, col=1
+    )
       # Diameter Distribution (Top Right)
     segment_names = [seg.name for seg in segments]
-    outer_diameters = [get_display_values(seg, units)['od'] for seg in segments]
-    inner_diameters = [get_display_values(seg, units)['id'] for seg in segments]
+    outer_diameters = [d['od'] for d in dv]
+    inner_diameters = [d['id'] for d in dv]
     
     fig.add_trace(
         go.Bar(x=segment_names, y=outer_diameters, name="Outer Diameter", marker_color="lightblue"),
@@ -436,8 +780,8 @@ def create_2d_visualization(segments, units):
     )
     
     # Mass Distribution (Bottom Left) - Stacked bar showing tube and fluid mass
-    tube_masses = [get_display_values(seg, units)['tube_mass'] for seg in segments]
-    fluid_masses = [get_display_values(seg, units)['fluid_mass'] for seg in segments]
+    tube_masses = [d['tube_mass'] for d in dv]
+    fluid_masses = [d['fluid_mass'] for d in dv]
     
     fig.add_trace(
         go.Bar(x=segment_names, y=tube_masses, name="Tube Mass", marker_color="orange"),
@@ -449,17 +793,18 @@ def create_2d_visualization(segments, units):
     )
     
     # Volume Distribution (Bottom Right)
-    volumes = [get_display_values(seg, units)['internal_volume'] for seg in segments]
+    volumes = [d['internal_volume'] for d in dv]
     fig.add_trace(
         go.Bar(x=segment_names, y=volumes, name="Internal Volume", marker_color="green"),
         row=2, col=2
     )
     
     # Update layout
-    length_unit = "m" if units == "metric" else "ft"
-    diameter_unit = "mm" if units == "metric" else "in"
-    mass_unit = "kg" if units == "metric" else "lb"
-    volume_unit = "m³" if units == "metric" else "ft³"
+    labels = UNITS_METRIC if units == "metric" else UNITS_IMPERIAL
+    length_unit = labels["length"]
+    diameter_unit = labels["diameter"]
+    mass_unit = labels["mass"]
+    volume_unit = labels["volume"]
     
     fig.update_xaxes(title_text=f"Position ({length_unit})", row=1, col=1)
     fig.update_yaxes(title_text=f"Diameter ({diameter_unit})", row=1, col=1)
@@ -476,81 +821,262 @@ def create_2d_visualization(segments, units):
     
     return fig
 
-def export_to_excel(segments, totals, units):
-    """Export results to Excel format"""
-    # Create DataFrame for segments
-    segment_data = []
-    for seg in segments:
-        length_unit = "m" if units == "metric" else "ft"
-        diameter_unit = "mm" if units == "metric" else "in"
-        mass_unit = "kg" if units == "metric" else "lb"
-        volume_unit = "m³" if units == "metric" else "ft³"
-        
-        # Get values converted to the target unit system
-        display_values = get_display_values(seg, units)
-        
-        segment_data.append({
-            "Segment Name": seg.name,
-            "Type": seg.tube_type,
-            "Size": seg.size,
-            "Wall Thickness": seg.wall_thickness,
-            f"Length ({length_unit})": round(display_values['length'], 3),
-            "Material": seg.material,
-            f"Outer Diameter ({diameter_unit})": round(display_values['od'], 3),
-            f"Inner Diameter ({diameter_unit})": round(display_values['id'], 3),
-            f"Wall Thickness ({diameter_unit})": round(display_values['wall_thickness_actual'], 3),
-            f"Internal Volume ({volume_unit})": round(display_values['internal_volume'], 6),
-            f"Material Volume ({volume_unit})": round(display_values['material_volume'], 6),
-            f"Tube Mass ({mass_unit})": round(display_values['tube_mass'], 3),
-            "Fluid": seg.fluid_name,
-            f"Temperature ({seg.temp_units})": seg.temperature,
-            f"Pressure ({seg.pressure_units})": seg.pressure,
-            "Fluid Phase": seg.fluid_phase,
-            f"Fluid Mass ({mass_unit})": round(display_values['fluid_mass'], 3),
-            f"Total Mass ({mass_unit})": round(display_values['mass'], 3),
-            "Continuous": seg.is_continuous
-        })
-    
-    df_segments = pd.DataFrame(segment_data)
-    
-    # Create DataFrame for totals
-    length_unit = "m" if units == "metric" else "ft"
-    mass_unit = "kg" if units == "metric" else "lb"
-    volume_unit = "m³" if units == "metric" else "ft³"
-    
-    totals_data = {
-        "Parameter": [
-            f"Total Length ({length_unit})",
-            f"Total Internal Volume ({volume_unit})",
-            f"Total Material Volume ({volume_unit})",
-            f"Total Tube Mass ({mass_unit})",
-            f"Total Fluid Mass ({mass_unit})",
-            f"Total System Mass ({mass_unit})"
-        ],
-        "Value": [
-            round(totals["total_length"], 3),
-            round(totals["total_internal_volume"], 6),
-            round(totals["total_material_volume"], 6),
-            round(totals["total_tube_mass"], 3),
-            round(totals["total_fluid_mass"], 3),
-            round(totals["total_mass"], 3)
-        ]
-    }
-    
-    df_totals = pd.DataFrame(totals_data)
-    
-    # Create Excel file in memory
+def _new_segments_version():
+    """Random starting point for the session's segment-list version counter
+
+    st.cache_data caches are shared across sessions, so a counter that
+    started at 0 everywhere would let concurrent sessions collide on the
+    same (version, units) key and serve each other's data. Seeding each
+    session with a 128-bit random value makes the version keys unique per
+    session while keeping bumps a cheap integer increment.
+    """
+    return uuid.uuid4().int
+
+def _bump_segments_version():
+    """Mark the segment list as modified, invalidating version-keyed caches"""
+    st.session_state.segments_version = st.session_state.get(
+        'segments_version', _new_segments_version()) + 1
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _segments_summary(version, units, _segments):
+    """Totals plus per-segment display values for the current segment list
+
+    Keyed on the session-unique segment-list version counter (the underscore
+    prefix stops Streamlit from hashing the segment objects themselves), so
+    the totals panel, segment list and CSV export all share one computation
+    per edit instead of redoing the conversion math every rerun.
+    """
+    dv = [get_display_values(seg, units) for seg in _segments]
+    return SegmentStore(_segments).totals(units), dv
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_export_rows(version, units, _segments):
+    """Shared export schema - headers plus one row tuple per segment,
+    computed in a single pass and consumed by both the Excel and CSV
+    writers, so preparing both files traverses the segments once"""
+    _, dv_list = _segments_summary(version, units, _segments)
+
+    labels = UNITS_METRIC if units == "metric" else UNITS_IMPERIAL
+    length_unit = labels["length"]
+    diameter_unit = labels["diameter"]
+    mass_unit = labels["mass"]
+    volume_unit = labels["volume"]
+    temp_unit = _segments[0].temp_units if _segments else "C"
+    pressure_unit = _segments[0].pressure_units if _segments else "bar"
+
+    headers = (
+        "Segment Name", "Type", "Size", "Wall Thickness",
+        f"Length ({length_unit})", "Material",
+        f"Outer Diameter ({diameter_unit})", f"Inner Diameter ({diameter_unit})",
+        f"Wall Thickness ({diameter_unit})", f"Internal Volume ({volume_unit})",
+        f"Material Volume ({volume_unit})", f"Tube Mass ({mass_unit})",
+        "Fluid", f"Temperature ({temp_unit})", f"Pressure ({pressure_unit})",
+        "Fluid Phase", f"Fluid Mass ({mass_unit})", f"Total Mass ({mass_unit})",
+        "Continuous"
+    )
+    rows = tuple(
+        (seg.name, seg.tube_type, seg.size, seg.wall_thickness,
+         round(d['length'], 3), seg.material,
+         round(d['od'], 3), round(d['id'], 3),
+         round(d['wall_thickness_actual'], 3),
+         round(d['internal_volume'], 6), round(d['material_volume'], 6),
+         round(d['tube_mass'], 3), seg.fluid_name,
+         seg.temperature, seg.pressure, seg.fluid_phase,
+         round(d['fluid_mass'], 3), round(d['mass'], 3),
+         seg.is_continuous)
+        for seg, d in zip(_segments, dv_list)
+    )
+    return headers, rows
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_csv_export(version, units, _segments):
+    """Cached CSV serialization - streams the shared export rows straight
+    through csv.writer; no per-row dicts and no DataFrame detour"""
+    headers, rows = _build_export_rows(version, units, _segments)
+    csv_buffer = StringIO()
+    csv_writer = csv.writer(csv_buffer, lineterminator="\n")
+    csv_writer.writerow(headers)
+    csv_writer.writerows(rows)
+    return csv_buffer.getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_visualization(version, units, _segments):
+    """Cached figure build - reruns that don't change the segment list or
+    unit system reuse the previous Plotly figure
+
+    Keyed on the segment-list version counter (bumped on every edit,
+    including continuity changes), so a cache hit costs one integer
+    comparison instead of hashing a per-segment digest. The counter is
+    seeded per session (see _new_segments_version), so entries in the
+    shared cache can't collide across concurrent sessions.
+    """
+    return create_2d_visualization(_segments, units)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_excel_export(version, units, _segments):
+    """Cached Excel serialization keyed on the segment-list version, so the
+    bytes blob is rebuilt only after an actual edit"""
+    headers, rows = _build_export_rows(version, units, _segments)
+    totals = SegmentStore(_segments).totals(units)
+    return export_to_excel(headers, rows, totals, units)
+
+def export_to_excel(headers, rows, totals, units):
+    """Export results to Excel format
+
+    Consumes the shared export rows from _build_export_rows and writes the
+    workbook directly with xlsxwriter rather than through pandas.to_excel:
+    one Format object per column style is created up front, rows are
+    streamed out with write_row, and constant_memory keeps only the current
+    row buffered.
+    """
+    import xlsxwriter
+
+    labels = UNITS_METRIC if units == "metric" else UNITS_IMPERIAL
+    length_unit = labels["length"]
+    mass_unit = labels["mass"]
+    volume_unit = labels["volume"]
+
+    # in_memory would silently override constant_memory, so the row buffer
+    # is left to spill to temp files as the streaming mode intends
     output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df_segments.to_excel(writer, sheet_name='Segments', index=False)
-        df_totals.to_excel(writer, sheet_name='Totals', index=False)
-    
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+
+    # One Format object per style, created outside the row loop
+    header_fmt = workbook.add_format({"bold": True})
+    num_fmt_3 = workbook.add_format({"num_format": "0.000"})
+    num_fmt_6 = workbook.add_format({"num_format": "0.000000"})
+
+    ws_segments = workbook.add_worksheet("Segments")
+    for col in (4, 6, 7, 8, 11, 16, 17):
+        ws_segments.set_column(col, col, None, num_fmt_3)
+    for col in (9, 10):
+        ws_segments.set_column(col, col, None, num_fmt_6)
+
+    ws_segments.write_row(0, 0, headers, header_fmt)
+    for row_idx, row in enumerate(rows, start=1):
+        ws_segments.write_row(row_idx, 0, row)
+
+    ws_totals = workbook.add_worksheet("Totals")
+    ws_totals.write_row(0, 0, ("Parameter", "Value"), header_fmt)
+    totals_rows = (
+        (f"Total Length ({length_unit})", round(totals["total_length"], 3)),
+        (f"Total Internal Volume ({volume_unit})", round(totals["total_internal_volume"], 6)),
+        (f"Total Material Volume ({volume_unit})", round(totals["total_material_volume"], 6)),
+        (f"Total Tube Mass ({mass_unit})", round(totals["total_tube_mass"], 3)),
+        (f"Total Fluid Mass ({mass_unit})", round(totals["total_fluid_mass"], 3)),
+        (f"Total System Mass ({mass_unit})", round(totals["total_mass"], 3))
+    )
+    for row_idx, row in enumerate(totals_rows, start=1):
+        ws_totals.write_row(row_idx, 0, row)
+
+    workbook.close()
     return output.getvalue()
 
+class _DensityLUT:
+    """Precomputed (T, P) → density lookup table for one CoolProp fluid
+
+    Built once per fluid with a single array-valued PropsSI sweep over a
+    T × log(P) grid, then queried with bilinear interpolation - roughly
+    microseconds instead of a full equation-of-state evaluation per lookup.
+    Cells whose corners failed to evaluate or disagree on phase straddle the
+    phase envelope, so queries there return None and the caller falls back
+    to a direct CoolProp call to preserve accuracy.
+    """
+
+    N_T = 128
+    N_P = 64
+    P_MIN = 1e3  # Pa
+
+    def __init__(self, coolprop_name):
+        PropsSI = _coolprop().PropsSI
+        self.coolprop_name = coolprop_name
+        t_min = PropsSI('Tmin', coolprop_name) + 0.1
+        t_max = min(PropsSI('Tmax', coolprop_name), 2000.0)
+        p_max = min(PropsSI('pmax', coolprop_name), 1e8)
+        self.t_grid = np.linspace(t_min, t_max, self.N_T)
+        self.p_grid = np.logspace(np.log10(self.P_MIN), np.log10(p_max), self.N_P)
+
+        tt, pp = np.meshgrid(self.t_grid, self.p_grid, indexing="ij")
+        self.density = np.asarray(
+            PropsSI('D', 'T', tt.ravel(), 'P', pp.ravel(), coolprop_name)
+        ).reshape(tt.shape)
+        phase = np.asarray(
+            PropsSI('Phase', 'T', tt.ravel(), 'P', pp.ravel(), coolprop_name)
+        ).reshape(tt.shape)
+        self.phase = np.where(np.isfinite(phase), phase, -1).astype(int)
+
+    def lookup(self, temp_K, pressure_Pa):
+        """Return (density_kg_m3, phase_index), or None if the point is
+        outside the grid or too close to a phase boundary"""
+        if not (self.t_grid[0] <= temp_K <= self.t_grid[-1]):
+            return None
+        if not (self.p_grid[0] <= pressure_Pa <= self.p_grid[-1]):
+            return None
+
+        i = min(max(np.searchsorted(self.t_grid, temp_K) - 1, 0), self.N_T - 2)
+        j = min(max(np.searchsorted(self.p_grid, pressure_Pa) - 1, 0), self.N_P - 2)
+
+        corners = self.density[i:i+2, j:j+2]
+        corner_phases = self.phase[i:i+2, j:j+2]
+        if not np.all(np.isfinite(corners)) or len(np.unique(corner_phases)) > 1:
+            return None
+
+        wt = (temp_K - self.t_grid[i]) / (self.t_grid[i+1] - self.t_grid[i])
+        wp = (pressure_Pa - self.p_grid[j]) / (self.p_grid[j+1] - self.p_grid[j])
+        density = ((1 - wt) * (1 - wp) * corners[0, 0] +
+                   wt * (1 - wp) * corners[1, 0] +
+                   (1 - wt) * wp * corners[0, 1] +
+                   wt * wp * corners[1, 1])
+        return float(density), int(corner_phases[0, 0])
+
+@functools.lru_cache(maxsize=None)
+def _get_state(coolprop_name):
+    """Cached CoolProp AbstractState so the HEOS backend is built once per fluid"""
+    return _coolprop().AbstractState('HEOS', coolprop_name)
+
+@st.cache_resource(show_spinner=False)
+def _get_density_lut(coolprop_name):
+    """Build (or fetch the cached) density LUT for a fluid"""
+    try:
+        return _DensityLUT(coolprop_name)
+    except Exception:
+        return None
+
+@functools.lru_cache(maxsize=4096)
+def _coolprop_density(coolprop_name, temp_K, pressure_Pa):
+    """Density/phase lookup on already-SI-converted scalars
+
+    Memoized so the sidebar preview and per-segment calls that express the
+    same state in different input units still collapse to one evaluation.
+    Returns (density_kg_m3, phase).
+    """
+    lut = _get_density_lut(coolprop_name)
+    hit = lut.lookup(temp_K, pressure_Pa) if lut is not None else None
+
+    if hit is not None:
+        density_kg_m3, phase_index = hit
+        phase = _phase_name(phase_index)
+    else:
+        # A single equation-of-state update yields both density and
+        # phase, instead of two separate PropsSI inversions
+        state = _get_state(coolprop_name)
+        state.update(_coolprop().PT_INPUTS, pressure_Pa, temp_K)
+        density_kg_m3 = state.rhomass()
+        try:
+            phase = _phase_name(int(state.phase()))
+        except:
+            phase = "Unknown"
+
+    return density_kg_m3, phase
+
+@st.cache_data(max_entries=512, show_spinner=False)
 def calculate_fluid_density(fluid_name, temperature, pressure, temp_units="K", pressure_units="Pa"):
     """
     Calculate fluid density using CoolProp
-    
+
+    The function is pure, so results are cached across Streamlit reruns -
+    repeated renders with unchanged inputs skip the CoolProp call entirely.
+
     Args:
         fluid_name: Name of the fluid from FLUIDS database
         temperature: Temperature value
@@ -571,24 +1097,10 @@ def calculate_fluid_density(fluid_name, temperature, pressure, temp_units="K", p
     
     try:
         coolprop_name = FLUIDS[fluid_name]["coolprop_name"]
-        
-        # Convert temperature to Kelvin
-        if temp_units == "C":
-            temp_K = temperature + 273.15
-        elif temp_units == "F":
-            temp_K = (temperature - 32) * 5/9 + 273.15
-        else:  # Kelvin
-            temp_K = temperature
-        
-        # Convert pressure to Pa
-        if pressure_units == "bar":
-            pressure_Pa = pressure * 100000
-        elif pressure_units == "psi":
-            pressure_Pa = pressure * 6894.76
-        elif pressure_units == "atm":
-            pressure_Pa = pressure * 101325
-        else:  # Pa
-            pressure_Pa = pressure
+
+        # Convert to SI units for CoolProp
+        temp_K = _to_kelvin(temperature, temp_units)
+        pressure_Pa = _to_pascal(pressure, pressure_units)
         
         # Check if inputs are reasonable
         if temp_K <= 0:
@@ -599,32 +1111,11 @@ def calculate_fluid_density(fluid_name, temperature, pressure, temp_units="K", p
             return {"density_kg_m3": 0.0, "density_lb_ft3": 0.0, "phase": "Invalid", 
                    "error_msg": "Pressure must be positive"}
         
-        # Calculate density in kg/m³
-        density_kg_m3 = PropsSI('D', 'T', temp_K, 'P', pressure_Pa, coolprop_name)
-        
+        density_kg_m3, phase = _coolprop_density(coolprop_name, temp_K, pressure_Pa)
+
         # Convert to lb/ft³
         density_lb_ft3 = density_kg_m3 * 0.062428
         
-        # Determine phase
-        try:
-            phase_index = PropsSI('Phase', 'T', temp_K, 'P', pressure_Pa, coolprop_name)
-            if phase_index == 0:
-                phase = "Liquid"
-            elif phase_index == 1:
-                phase = "Supercritical"
-            elif phase_index == 2:
-                phase = "Supercritical Gas"
-            elif phase_index == 3:
-                phase = "Supercritical Liquid"
-            elif phase_index == 5:
-                phase = "Gas"
-            elif phase_index == 6:
-                phase = "Two Phase"
-            else:
-                phase = f"Phase {phase_index}"
-        except:
-            phase = "Unknown"
-        
         return {
             "density_kg_m3": density_kg_m3,
             "density_lb_ft3": density_lb_ft3,
@@ -695,12 +1186,110 @@ def get_default_conditions(fluid_name, units="metric"):
             "pressure_units": "psi"
         }
 
+# Frozen at import: every (fluid, units) combination, so reruns look up the
+# defaults instead of rebuilding the conditions table on each call
+DEFAULT_CONDS = {(f, u): get_default_conditions(f, u)
+                 for f in FLUID_NAMES for u in ("metric", "imperial")}
+
+def _refresh_fluid_preview():
+    """on_change callback for the sidebar fluid widgets.
+
+    Recomputes the fluid-property preview only when the fluid, temperature,
+    or pressure widget actually changes and stashes the result in session
+    state; reruns triggered by other widgets just read the cached dict.
+    """
+    fluid_name = st.session_state.get("global_fluid_select", "None")
+    if fluid_name == "None":
+        st.session_state.fluid_props_cache = None
+        return
+    units = st.session_state.get("last_units", "metric")
+    labels = UNITS_METRIC if units == "metric" else UNITS_IMPERIAL
+    defaults = DEFAULT_CONDS[(fluid_name, units)]
+    st.session_state.fluid_props_cache = calculate_fluid_density(
+        fluid_name,
+        st.session_state.get("global_temperature_sidebar", defaults["temperature"]),
+        st.session_state.get("global_pressure_sidebar", defaults["pressure"]),
+        labels["temp_cp"], labels["pressure_cp"]
+    )
+
+@st.fragment
+def _viz_fragment(units):
+    """Visualization block, isolated from full-script reruns
+
+    Interacting with the controls inside (show toggle, aspect-ratio slider)
+    reruns only this fragment, so dragging the slider re-renders the cached
+    figure without re-executing the sidebar, segment list, or totals.
+    Continuity edits change data the rest of the page displays, so those
+    still trigger a full rerun.
+    """
+    show_viz = st.checkbox("Show 2D Visualization", value=True)
+
+    if not show_viz:
+        return
+
+    # Visualization controls
+    col_viz1, col_viz2 = st.columns([1, 1])
+    with col_viz1:
+        aspect_ratio = st.slider("🎛️ Visual Aspect Ratio (Y/X)", 0.1, 5.0, 1.0, step=0.1,
+                               help="Adjust the visual scaling of the system layout diagram")
+    with col_viz2:
+        st.write("")  # Spacer for future controls
+
+    # Update continuity settings - one editable boolean column instead of
+    # one checkbox widget per segment. The first segment has no continuity
+    # semantics (it always starts the system), so it is left out of the
+    # editor rather than shown as an editable cell whose edits would be
+    # discarded.
+    continuity_changed = False
+    if len(st.session_state.segments) > 1:
+        st.subheader("Segment Continuity Settings")
+        st.caption(f"{st.session_state.segments[0].name} starts the system; "
+                   "set whether each later segment continues from the previous one.")
+        cont_df = pd.DataFrame({
+            "segment": [seg.name for seg in st.session_state.segments[1:]],
+            "continuous": [seg.is_continuous for seg in st.session_state.segments[1:]]
+        })
+        edited = st.data_editor(
+            cont_df,
+            disabled=["segment"],
+            num_rows="fixed",
+            hide_index=True,
+            use_container_width=True,
+            key="continuity_editor"
+        )
+        for i, segment in enumerate(st.session_state.segments[1:]):
+            is_continuous = bool(edited["continuous"].iloc[i])
+            if is_continuous != segment.is_continuous:
+                segment.is_continuous = is_continuous
+                continuity_changed = True
+        if continuity_changed:
+            _bump_segments_version()
+
+    # Generate and display visualization (cached across reruns that don't
+    # change the segment list)
+    fig = _build_visualization(
+        st.session_state.segments_version, units, st.session_state.segments)
+    if fig:
+        # Apply aspect ratio to the system layout plot
+        fig.update_yaxes(scaleanchor="x", scaleratio=aspect_ratio, row=1, col=1)
+        st.plotly_chart(fig, use_container_width=True)
+
+    if continuity_changed:
+        # Sync the segment list and exports outside the fragment
+        st.rerun()
+
 def main():
     """Main Streamlit application"""
-    
+
     # Initialize session state
     if 'segments' not in st.session_state:
         st.session_state.segments = []
+    if 'segments_version' not in st.session_state:
+        st.session_state.segments_version = _new_segments_version()
+    if 'seg_store' not in st.session_state:
+        # Structure-of-arrays mirror of the segment list, maintained
+        # incrementally on add/delete so totals never loop over segments
+        st.session_state.seg_store = SegmentStore(st.session_state.segments)
     
     # Title and description
     st.title("🚀 Tube and Pipe Calculator")
@@ -724,7 +1313,12 @@ def main():
         if units != st.session_state.last_units:
             st.warning("⚠️ **Unit system changed!** Please verify all input values in the form before adding segments.")
             st.session_state.last_units = units
-        
+            # Cached preview was computed in the old unit system
+            st.session_state.fluid_props_cache = None
+
+        # Every display label below derives from the units flag
+        U = UNITS_METRIC if units == "metric" else UNITS_IMPERIAL
+
         st.divider()
         
         # Fluid Properties Section
@@ -740,11 +1334,12 @@ def main():
             st.session_state.global_pressure = 1.013
         
         # Fluid selection
-        fluid_options = list(FLUIDS.keys())
+        fluid_options = FLUID_NAMES
         fluid_name = st.selectbox(
             "Fluid Type",
             fluid_options,
             key="global_fluid_select",
+            on_change=_refresh_fluid_preview,
             help="Select the fluid inside the tube/pipe"
         )
         st.session_state.global_fluid_name = fluid_name
@@ -753,98 +1348,98 @@ def main():
         if fluid_name != "None":
             st.caption(f"ℹ️ {FLUIDS[fluid_name]['description']}")
             
-            # Get default conditions for the selected fluid
-            defaults = get_default_conditions(fluid_name, units)
+            # Default conditions for the selected fluid (frozen at import)
+            defaults = DEFAULT_CONDS[(fluid_name, units)]
             
             # Temperature input
-            temp_unit = "°C" if units == "metric" else "°F"
             temperature = st.number_input(
-                f"Temperature ({temp_unit})",
+                f"Temperature ({U['temp']})",
                 value=float(defaults["temperature"]),
                 step=1.0,
                 key="global_temperature_sidebar",
+                on_change=_refresh_fluid_preview,
                 help="Operating temperature of the fluid"
             )
             st.session_state.global_temperature = temperature
             
             # Pressure input
-            pressure_unit = "bar" if units == "metric" else "psi"
             pressure = st.number_input(
-                f"Pressure ({pressure_unit})",
+                f"Pressure ({U['pressure']})",
                 min_value=0.001,
                 value=float(defaults["pressure"]),
                 step=0.1,
                 key="global_pressure_sidebar",
+                on_change=_refresh_fluid_preview,
                 help="Operating pressure of the fluid"
             )
             st.session_state.global_pressure = pressure
             
-            # Calculate and display fluid properties preview
-            temp_units_coolprop = "C" if units == "metric" else "F"
-            pressure_units_coolprop = "bar" if units == "metric" else "psi"
-            
-            fluid_props = calculate_fluid_density(
-                fluid_name, temperature, pressure, 
-                temp_units_coolprop, pressure_units_coolprop
-            )
-            
+            # Display the fluid properties preview from the callback cache;
+            # populate it on the first run (no widget change has fired yet)
+            if st.session_state.get("fluid_props_cache") is None:
+                _refresh_fluid_preview()
+            fluid_props = st.session_state.fluid_props_cache
+
             if fluid_props["error_msg"]:
                 st.warning(f"⚠️ {fluid_props['error_msg']}")
             else:
-                density_unit = "kg/m³" if units == "metric" else "lb/ft³"
                 density_value = fluid_props["density_kg_m3"] if units == "metric" else fluid_props["density_lb_ft3"]
-                st.caption(f"🧪 **Density:** {density_value:.3f} {density_unit}")
+                st.caption(f"🧪 **Density:** {density_value:.3f} {U['density']}")
                 st.caption(f"**Phase:** {fluid_props['phase']}")
         else:
             # Reset to default values for "None"
             st.session_state.global_temperature = 20.0 if units == "metric" else 68.0
             st.session_state.global_pressure = 1.013 if units == "metric" else 14.7
-        
+
+        # Bulk-apply the sidebar fluid settings to segments already in the
+        # system - one vectorized recompute instead of per-segment passes
+        if st.session_state.segments:
+            if st.button("🔄 Apply Fluid to All Segments"):
+                for seg in st.session_state.segments:
+                    seg.fluid_name = st.session_state.global_fluid_name
+                    seg.temperature = st.session_state.global_temperature
+                    seg.pressure = st.session_state.global_pressure
+                    seg.temp_units = U["temp_cp"]
+                    seg.pressure_units = U["pressure_cp"]
+                recompute_segments(st.session_state.segments)
+                st.session_state.seg_store.rebuild(st.session_state.segments)
+                _bump_segments_version()
+                st.success("Fluid settings applied to all segments!")
+                st.rerun()
+
         st.divider()
         
         # Export section
         st.header("📊 Export Data")
         if st.session_state.segments:
-            totals = calculate_totals(st.session_state.segments, units)
-            
-            excel_data = export_to_excel(st.session_state.segments, totals, units)
-            st.download_button(
-                label="📊 Download Excel Report",
-                data=excel_data,
-                file_name="tube_calculator_report.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )            # CSV export
-            segment_data = []
-            for seg in st.session_state.segments:
-                # Get values converted to the target unit system
-                display_values = get_display_values(seg, units)
-                segment_data.append({
-                    "Name": seg.name,
-                    "Type": seg.tube_type,
-                    "Size": seg.size,
-                    "Wall_Thickness": seg.wall_thickness,
-                    "Length": display_values['length'],
-                    "Material": seg.material,
-                    "OD": display_values['od'],
-                    "ID": display_values['id'],
-                    "Internal_Volume": display_values['internal_volume'],
-                    "Tube_Mass": display_values['tube_mass'],
-                    "Fluid": seg.fluid_name,
-                    "Fluid_Phase": seg.fluid_phase,
-                    "Fluid_Mass": display_values['fluid_mass'],
-                    "Total_Mass": display_values['mass'],
-                    "Continuous": seg.is_continuous
-                })
-            
-            df_csv = pd.DataFrame(segment_data)
-            csv_data = df_csv.to_csv(index=False)
-            
-            st.download_button(
-                label="📄 Download CSV Data",
-                data=csv_data,
-                file_name="tube_calculator_data.csv",
-                mime="text/csv"
-            )
+            # Serialization only happens when the user asks for it; the
+            # prepared bytes are kept in session state and offered for
+            # download as long as they match the current segment list
+            export_key = (st.session_state.segments_version, units)
+
+            if st.button("🛠️ Prepare Excel Report"):
+                st.session_state.export_excel_bytes = _build_excel_export(
+                    st.session_state.segments_version, units, st.session_state.segments)
+                st.session_state.export_excel_key = export_key
+            if st.session_state.get('export_excel_key') == export_key:
+                st.download_button(
+                    label="📊 Download Excel Report",
+                    data=st.session_state.export_excel_bytes,
+                    file_name="tube_calculator_report.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+
+            if st.button("🛠️ Prepare CSV Data"):
+                st.session_state.export_csv_bytes = _build_csv_export(
+                    st.session_state.segments_version, units, st.session_state.segments)
+                st.session_state.export_csv_key = export_key
+            if st.session_state.get('export_csv_key') == export_key:
+                st.download_button(
+                    label="📄 Download CSV Data",
+                    data=st.session_state.export_csv_bytes,
+                    file_name="tube_calculator_data.csv",
+                    mime="text/csv"
+                )
         else:
             st.info("Add segments to enable export")
     
@@ -872,11 +1467,10 @@ def main():
             index=0 if st.session_state.form_tube_type == "Tube" else 1,
             key="tube_type_select"
         )
-          # Update session state when tube type changes
-        if tube_type != st.session_state.form_tube_type:
-            st.session_state.form_tube_type = tube_type
-            # Force a rerun to refresh the size options immediately
-            st.rerun()
+        # The size selectbox below reads tube_type in this same script pass,
+        # so no forced rerun is needed when it changes - the old st.rerun()
+        # here doubled the cost of every tube-type toggle
+        st.session_state.form_tube_type = tube_type
         
         with st.form("add_segment"):
             # Segment name
@@ -884,13 +1478,12 @@ def main():
             
             # Size selection with proper state management
             if tube_type == "Tube":
-                size_options = list(TUBE_SIZES.keys())
-                try:
-                    current_index = size_options.index(st.session_state.form_tube_size)
-                except ValueError:
-                    current_index = size_options.index("1/2\"") if "1/2\"" in size_options else 0
+                size_options = TUBE_SIZE_NAMES
+                current_index = TUBE_SIZE_INDEX.get(st.session_state.form_tube_size)
+                if current_index is None:
+                    current_index = TUBE_SIZE_INDEX.get("1/2\"", 0)
                     st.session_state.form_tube_size = size_options[current_index]
-                
+
                 size = st.selectbox(
                     "Size", 
                     size_options, 
@@ -906,13 +1499,12 @@ def main():
                 st.caption(f"📐 OD: {od_in}\" ({od_mm} mm)")
                 
             else:
-                size_options = list(PIPE_SIZES.keys())
-                try:
-                    current_index = size_options.index(st.session_state.form_pipe_size)
-                except ValueError:
-                    current_index = size_options.index("1/2\" NPS") if "1/2\" NPS" in size_options else 0
+                size_options = PIPE_SIZE_NAMES
+                current_index = PIPE_SIZE_INDEX.get(st.session_state.form_pipe_size)
+                if current_index is None:
+                    current_index = PIPE_SIZE_INDEX.get("1/2\" NPS", 0)
                     st.session_state.form_pipe_size = size_options[current_index]
-                
+
                 size = st.selectbox(
                     "Size", 
                     size_options, 
@@ -928,13 +1520,12 @@ def main():
                 st.caption(f"📐 Actual OD: {od_in}\" ({od_mm} mm)")
             
             # Wall thickness
-            wall_thickness_options = list(WALL_THICKNESS.keys())
-            try:
-                wt_index = wall_thickness_options.index(st.session_state.form_wall_thickness)
-            except ValueError:
-                wt_index = wall_thickness_options.index("0.065\"") if "0.065\"" in wall_thickness_options else 0
+            wall_thickness_options = WALL_THICKNESS_NAMES
+            wt_index = WALL_THICKNESS_INDEX.get(st.session_state.form_wall_thickness)
+            if wt_index is None:
+                wt_index = WALL_THICKNESS_INDEX.get("0.065\"", 0)
                 st.session_state.form_wall_thickness = wall_thickness_options[wt_index]
-            
+
             wall_thickness = st.selectbox(
                 "Wall Thickness", 
                 wall_thickness_options, 
@@ -949,32 +1540,24 @@ def main():
             st.caption(f"📏 Selected: {wt_in}\" ({wt_mm} mm)")
             
             # Calculate and show resulting inner diameter as preview
-            if tube_type == "Tube":
-                od_preview = TUBE_SIZES[size]['od_in'] if units == 'imperial' else TUBE_SIZES[size]['od_mm']
-            else:
-                od_preview = PIPE_SIZES[size]['od_in'] if units == 'imperial' else PIPE_SIZES[size]['od_mm']
-            
-            wt_preview = WALL_THICKNESS[wall_thickness]['in'] if units == 'imperial' else WALL_THICKNESS[wall_thickness]['mm']
-            id_preview = od_preview - 2 * wt_preview
-            unit_label = "in" if units == 'imperial' else "mm"
-            
+            od_preview, wt_preview, id_preview = _resolve_geometry(
+                tube_type, size, wall_thickness, units)
+
             if id_preview > 0:
-                st.caption(f"🔍 **Resulting ID:** {id_preview:.3f} {unit_label}")
+                st.caption(f"🔍 **Resulting ID:** {id_preview:.3f} {U['diameter']}")
             else:
                 st.caption(f"⚠️ **Warning:** Wall too thick - would result in negative ID!")
-            
+
             # Length
-            length_unit = "meters" if units == "metric" else "feet"
-            length = st.number_input(f"Length ({length_unit})", min_value=0.001, value=1.0, step=0.1, key="length_input")
+            length = st.number_input(f"Length ({U['length_input']})", min_value=0.001, value=1.0, step=0.1, key="length_input")
             
             # Material
-            material_options = list(MATERIALS.keys())
-            try:
-                material_index = material_options.index(st.session_state.form_material)
-            except ValueError:
-                material_index = material_options.index("Stainless Steel 316L") if "Stainless Steel 316L" in material_options else 0
+            material_options = MATERIAL_NAMES
+            material_index = MATERIAL_INDEX.get(st.session_state.form_material)
+            if material_index is None:
+                material_index = MATERIAL_INDEX.get("Stainless Steel 316L", 0)
                 st.session_state.form_material = material_options[material_index]
-            
+
             material = st.selectbox(
                 "Material", 
                 material_options, 
@@ -991,34 +1574,24 @@ def main():
             st.divider()
             st.write(f"**Selected Fluid:** {st.session_state.global_fluid_name}")
             if st.session_state.global_fluid_name != "None":
-                temp_unit = "°C" if units == "metric" else "°F"
-                pressure_unit = "bar" if units == "metric" else "psi"
-                st.write(f"**Temperature:** {st.session_state.global_temperature:.1f} {temp_unit}")
-                st.write(f"**Pressure:** {st.session_state.global_pressure:.2f} {pressure_unit}")
+                st.write(f"**Temperature:** {st.session_state.global_temperature:.1f} {U['temp']}")
+                st.write(f"**Pressure:** {st.session_state.global_pressure:.2f} {U['pressure']}")
             
             # Continuous checkbox
             is_continuous = st.checkbox("Continuous with previous segment", value=True, key="continuous_checkbox")
               # Add segment button
             if st.form_submit_button("Add Segment", type="primary"):
-                # Get the OD for the selected size for validation
-                if tube_type == "Tube":
-                    od_val = TUBE_SIZES[size]['od_in'] if units == 'imperial' else TUBE_SIZES[size]['od_mm']
-                else:
-                    od_val = PIPE_SIZES[size]['od_in'] if units == 'imperial' else PIPE_SIZES[size]['od_mm']
-                
-                # Get the wall thickness for validation
-                wt_val = WALL_THICKNESS[wall_thickness]['in'] if units == 'imperial' else WALL_THICKNESS[wall_thickness]['mm']
-                
+                # Get the OD and wall thickness for validation (cache hit
+                # from the preview above)
+                od_val, wt_val, _ = _resolve_geometry(
+                    tube_type, size, wall_thickness, units)
+
                 # Validation check
                 if wt_val * 2 >= od_val:
-                    unit_label = "in" if units == 'imperial' else "mm"
-                    st.error(f"❌ **Invalid Geometry:** Total wall thickness ({wt_val*2:.3f} {unit_label}) cannot be greater than or equal to the Outer Diameter ({od_val:.3f} {unit_label}). Please select a smaller wall thickness.")
+                    st.error(f"❌ **Invalid Geometry:** Total wall thickness ({wt_val*2:.3f} {U['diameter']}) cannot be greater than or equal to the Outer Diameter ({od_val:.3f} {U['diameter']}). Please select a smaller wall thickness.")
                 else:
                     try:
                         # Create segment with error handling
-                        temp_units_coolprop = "C" if units == "metric" else "F"
-                        pressure_units_coolprop = "bar" if units == "metric" else "psi"
-                        
                         new_segment = TubeSegment(
                             name=segment_name,
                             tube_type=tube_type,
@@ -1030,11 +1603,13 @@ def main():
                             fluid_name=st.session_state.global_fluid_name,
                             temperature=st.session_state.global_temperature,
                             pressure=st.session_state.global_pressure,
-                            temp_units=temp_units_coolprop,
-                            pressure_units=pressure_units_coolprop
+                            temp_units=U["temp_cp"],
+                            pressure_units=U["pressure_cp"]
                         )
                         new_segment.is_continuous = is_continuous
                         st.session_state.segments.append(new_segment)
+                        st.session_state.seg_store.append(new_segment)
+                        _bump_segments_version()
                         st.success(f"✅ Added segment: {segment_name} - {tube_type} {size} with {st.session_state.global_fluid_name}")
                         st.rerun()
                         
@@ -1045,34 +1620,49 @@ def main():
         st.header("📋 Current Segments")
         
         if st.session_state.segments:
-            for i, segment in enumerate(st.session_state.segments):
-                with st.expander(f"{segment.name} ({segment.tube_type} - {segment.size})", expanded=False):
-                    col_a, col_b = st.columns([3, 1])
-                    
-                    with col_a:
-                        length_unit = "m" if units == "metric" else "ft"
-                        diameter_unit = "mm" if units == "metric" else "in"
-                        mass_unit = "kg" if units == "metric" else "lb"
-                        volume_unit = "m³" if units == "metric" else "ft³"
-                          # Get converted values for display
-                        display_values = get_display_values(segment, units)
-                        
-                        st.write(f"**Length:** {round(display_values['length'], 2)} {length_unit}")
-                        st.write(f"**OD:** {round(display_values['od'], 3)} {diameter_unit}")
-                        st.write(f"**ID:** {round(display_values['id'], 3)} {diameter_unit}")
-                        st.write(f"**Tube Mass:** {round(display_values['tube_mass'], 3)} {mass_unit}")
-                        st.write(f"**Fluid:** {segment.fluid_name} ({segment.fluid_phase})")
-                        if segment.fluid_name != "None":
-                            st.write(f"**Fluid Mass:** {round(display_values['fluid_mass'], 3)} {mass_unit}")
-                        st.write(f"**Total Mass:** {round(display_values['mass'], 3)} {mass_unit}")
-                        st.write(f"**Volume:** {round(display_values['internal_volume'], 6)} {volume_unit}")
-                        st.write(f"**Material:** {segment.material}")
-                        st.write(f"**Continuous:** {'Yes' if segment.is_continuous else 'No'}")
-                    
-                    with col_b:
-                        if st.button("🗑️", key=f"delete_{i}", help="Delete segment"):
-                            st.session_state.segments.pop(i)
-                            st.rerun()
+            _, dv_list = _segments_summary(
+                st.session_state.segments_version, units, st.session_state.segments)
+
+            length_unit = U["length"]
+            diameter_unit = U["diameter"]
+            mass_unit = U["mass"]
+            volume_unit = U["volume"]
+
+            # One st.dataframe instead of N expanders full of st.write calls -
+            # a single frontend message regardless of segment count.
+            segments_df = pd.DataFrame({
+                "Name": [seg.name for seg in st.session_state.segments],
+                "Type": [f"{seg.tube_type} - {seg.size}" for seg in st.session_state.segments],
+                f"Length ({length_unit})": [round(d['length'], 2) for d in dv_list],
+                f"OD ({diameter_unit})": [round(d['od'], 3) for d in dv_list],
+                f"ID ({diameter_unit})": [round(d['id'], 3) for d in dv_list],
+                f"Tube Mass ({mass_unit})": [round(d['tube_mass'], 3) for d in dv_list],
+                "Fluid": [f"{seg.fluid_name} ({seg.fluid_phase})" if seg.fluid_name != "None" else "None"
+                          for seg in st.session_state.segments],
+                f"Fluid Mass ({mass_unit})": [round(d['fluid_mass'], 3) for d in dv_list],
+                f"Total Mass ({mass_unit})": [round(d['mass'], 3) for d in dv_list],
+                f"Volume ({volume_unit})": [round(d['internal_volume'], 6) for d in dv_list],
+                "Material": [seg.material for seg in st.session_state.segments],
+                "Continuous": ["Yes" if seg.is_continuous else "No"
+                               for seg in st.session_state.segments],
+            })
+            st.dataframe(segments_df, use_container_width=True, hide_index=True)
+
+            del_col1, del_col2 = st.columns([3, 1])
+            with del_col1:
+                delete_choice = st.selectbox(
+                    "Delete segment",
+                    options=list(range(len(st.session_state.segments))),
+                    format_func=lambda i: st.session_state.segments[i].name,
+                    key="delete_choice"
+                )
+            with del_col2:
+                st.write("")
+                if st.button("🗑️ Delete", key="delete_confirm"):
+                    st.session_state.segments.pop(delete_choice)
+                    st.session_state.seg_store.remove(delete_choice)
+                    _bump_segments_version()
+                    st.rerun()
         else:
             st.info("No segments added yet. Use the form on the left to add your first segment.")
     
@@ -1080,72 +1670,38 @@ def main():
     if st.session_state.segments:
         st.divider()
         st.header("📊 System Totals")
-        
-        totals = calculate_totals(st.session_state.segments, units)
-        
-        col1, col2, col3, col4, col5 = st.columns(5)
-        
-        length_unit = "m" if units == "metric" else "ft"
-        mass_unit = "kg" if units == "metric" else "lb"
-        volume_unit = "m³" if units == "metric" else "ft³"
-        
-        with col1:
-            st.metric("Total Length", f"{totals['total_length']:.2f} {length_unit}")
-        
-        with col2:
-            st.metric("Tube Mass", f"{totals['total_tube_mass']:.3f} {mass_unit}")
-        
-        with col3:
-            st.metric("Fluid Mass", f"{totals['total_fluid_mass']:.3f} {mass_unit}")
-        
-        with col4:
-            st.metric("Total Mass", f"{totals['total_mass']:.3f} {mass_unit}")
-        
-        with col5:
-            st.metric("Internal Volume", f"{totals['total_internal_volume']:.6f} {volume_unit}")
+
+        # Totals come straight from the incrementally maintained SoA mirror
+        totals = st.session_state.seg_store.totals(units)
+
+        # Format every metric in one pass, then emit them in a loop
+        metric_names = ("Total Length", "Tube Mass", "Fluid Mass",
+                        "Total Mass", "Internal Volume")
+        values = (totals['total_length'], totals['total_tube_mass'],
+                  totals['total_fluid_mass'], totals['total_mass'],
+                  totals['total_internal_volume'])
+        precisions = (2, 3, 3, 3, 6)
+        metric_units = (U["length"], U["mass"], U["mass"], U["mass"], U["volume"])
+        labels = tuple(f"{v:.{p}f} {u}"
+                       for v, p, u in zip(values, precisions, metric_units))
+
+        for col, name, label in zip(st.columns(5), metric_names, labels):
+            with col:
+                st.metric(name, label)
     
     # Visualization section
     if st.session_state.segments:
         st.divider()
         st.header("📈 2D Visualization")
-        
-        # Visualization controls
-        show_viz = st.checkbox("Show 2D Visualization", value=True)
-        
-        if show_viz:
-            # Visualization controls
-            col_viz1, col_viz2 = st.columns([1, 1])
-            with col_viz1:
-                aspect_ratio = st.slider("🎛️ Visual Aspect Ratio (Y/X)", 0.1, 5.0, 1.0, step=0.1, 
-                                       help="Adjust the visual scaling of the system layout diagram")
-            with col_viz2:
-                st.write("")  # Spacer for future controls
-            
-            # Update continuity settings
-            st.subheader("Segment Continuity Settings")
-            cols = st.columns(min(len(st.session_state.segments), 4))
-            
-            for i, segment in enumerate(st.session_state.segments):
-                with cols[i % 4]:
-                    segment.is_continuous = st.checkbox(
-                        f"{segment.name} continuous",
-                        value=segment.is_continuous,
-                        key=f"continuous_{i}",
-                        disabled=(i == 0)  # First segment can't be continuous
-                    )
-            
-            # Generate and display visualization
-            fig = create_2d_visualization(st.session_state.segments, units)
-            if fig:
-                # Apply aspect ratio to the system layout plot
-                fig.update_yaxes(scaleanchor="x", scaleratio=aspect_ratio, row=1, col=1)
-                st.plotly_chart(fig, use_container_width=True)
-    
+        _viz_fragment(units)
+
     # Clear all button
     if st.session_state.segments:
         st.divider()
         if st.button("🗑️ Clear All Segments", type="secondary"):
             st.session_state.segments = []
+            st.session_state.seg_store = SegmentStore()
+            _bump_segments_version()
             st.success("All segments cleared!")
             st.rerun()
     